@@ -1,8 +1,15 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple
-import numpy as np
-from schema import ProjectInput, DecisionOutput
+from functools import lru_cache
+from operator import attrgetter
+import math
+from typing import TYPE_CHECKING, Tuple
+from schema import AnyProjectInput, ProjectInput, DecisionOutput
+
+if TYPE_CHECKING:
+    # NumPy and pandas are only needed by the batch scorer, which imports them lazily.
+    import numpy as np
+    import pandas as pd
 
 @dataclass(frozen=True)
 class Weights:
@@ -24,137 +31,180 @@ class Weights:
 
 DEFAULT_WEIGHTS = Weights()
 
-def _scale_1_to_5(x: int) -> float:
-    # Convert 1..5 into 0..1
-    return (x - 1) / 4.0
-
-def _clip_0_1(x: float) -> float:
-    return float(np.clip(x, 0.0, 1.0))
-
-def _normalize_cost(cost_usd: int) -> float:
-    # Simple normalization: 0..5M maps roughly to 0..1, saturates after
-    return _clip_0_1(cost_usd / 5_000_000)
-
-def _normalize_duration(weeks: int) -> float:
-    return _clip_0_1(weeks / 52)
+# Fields that affect the score, in the order used by the scoring kernels and the
+# run_decision cache key. Scales first, then raw counts.
+_FEATURE_COLUMNS = (
+    "customer_impact",
+    "strategic_alignment",
+    "technical_complexity",
+    "delivery_risk",
+    "compliance_risk",
+    "has_exec_sponsor",
+    "dependencies_count",
+    "team_size",
+    "duration_weeks",
+    "estimated_cost_usd",
+)
+
+def _kernels(w: Weights) -> Tuple[Tuple[float, float, float], ...]:
+    # (lo, saturation, signed weight per unit) for each field in _FEATURE_COLUMNS.
+    # A field adds weight * clip(value - lo, 0, saturation), which folds normalization
+    # to 0..1 into the weight. Positive signals add, risk and size signals subtract.
+    return (
+        (1, 4, w.customer_impact / 4),
+        (1, 4, w.strategic_alignment / 4),
+        (1, 4, -w.technical_complexity / 4),
+        (1, 4, -w.delivery_risk / 4),
+        (1, 4, -w.compliance_risk / 4),
+        (0, 1, w.exec_sponsor),
+        (0, 15, -w.dependencies / 15),
+        (0, 50, -w.team_size / 50),
+        (0, 52, -w.duration / 52),
+        (0, 5_000_000, -w.cost / 5_000_000),
+    )
 
-def _normalize_team(team_size: int) -> float:
-    return _clip_0_1(team_size / 50)
+_KERNELS = _kernels(DEFAULT_WEIGHTS)
+_FEATURE_GETTER = attrgetter(*_FEATURE_COLUMNS)
+
+# Precomputed 0..100 sigmoid mapping. raw is bounded in [-1, 1] because each side's
+# weights sum to at most 1 and every feature is in [0, 1], so 4096 steps cover it.
+_SIGMOID_STEPS = 4096
+_SIGMOID_LUT = tuple(
+    round(100 / (1 + math.exp(-6 * (i / (_SIGMOID_STEPS / 2) - 1)))) for i in range(_SIGMOID_STEPS + 1)
+)
+
+# (field, threshold, message). A field at or above its threshold adds the message.
+# has_exec_sponsor uses True as its threshold, so only a confirmed sponsor triggers it.
+_RATIONALE_RULES = (
+    ("customer_impact", 4, "High customer impact increases priority and expected ROI."),
+    ("strategic_alignment", 4, "Strong strategic alignment supports funding and stakeholder commitment."),
+    ("has_exec_sponsor", True, "Executive sponsorship reduces coordination risk and accelerates decisions."),
+    ("delivery_risk", 4, "High delivery risk suggests you need stronger plan, milestones, and contingency."),
+    ("technical_complexity", 4, "High technical complexity suggests discovery, architecture review, and phased rollout."),
+    ("compliance_risk", 4, "High compliance risk requires early security and legal review with clear controls."),
+    ("dependencies_count", 8, "Many dependencies increase schedule risk. Consider de-risking or reducing scope."),
+    ("duration_weeks", 26, "Long duration increases risk. Consider an MVP milestone or phased delivery."),
+)
+
+_NEXT_GO = (
+    "Lock success metrics. North Star plus 3 supporting KPIs.",
+    "Create a milestone plan. Discovery, MVP, rollout.",
+    "Confirm resourcing and ownership across teams.",
+)
+
+_NEXT_REVIEW = (
+    "Identify the top 3 risks and create a mitigation plan with owners.",
+    "Reduce scope to an MVP. One user journey, one workflow.",
+    "Confirm dependency commitments in writing.",
+    "Add instrumentation and an A/B test plan if user-facing.",
+)
+
+_NEXT_NOGO = (
+    "Write a one-page alternative plan. Smaller scope or different approach.",
+    "Re-evaluate after risks are reduced or strategy changes.",
+    "If still needed, run a discovery spike to validate feasibility and cost.",
+)
+
+_GUARDRAILS = (
+    "Define success metrics and leading indicators before execution.",
+    "Require a written risk register with owners and mitigation dates.",
+    "Use stage gates for funding. Discovery, MVP, Scale.",
+)
+
+# Indexed by tier: 0 = NO-GO, 1 = NEEDS REVIEW, 2 = GO.
+_TIERS = (
+    ("NO-GO", _NEXT_NOGO),
+    ("NEEDS REVIEW", _NEXT_REVIEW),
+    ("GO", _NEXT_GO),
+)
+
+# (match, fields, threshold, message) per tier. When match (any/all) of the fields
+# are at or above the threshold, the message is prepended to that tier's next steps.
+_TIER_PREFIX_RULES = (
+    (all, ("customer_impact", "strategic_alignment"), 4,
+     "This looks valuable, but current risk is too high. De-risk with discovery and an MVP."),
+    (any, ("compliance_risk",), 4,
+     "Schedule security and compliance review within 7 days."),
+    (any, ("delivery_risk", "technical_complexity"), 4,
+     "Run a 2-week discovery sprint to validate approach and reduce risk."),
+)
+
+def _score_numeric(values: Tuple[int, ...], kernels: Tuple[Tuple[float, float, float], ...]) -> int:
+    # Arithmetic core of score_project. values are raw fields, in _FEATURE_COLUMNS order.
+    # Clamp to [0, saturation]; ProjectInputFast values are not range-checked.
+    raw = 0.0
+    for x, (lo, sat, eff_w) in zip(values, kernels):
+        x -= lo
+        raw += eff_w * (0 if x < 0 else (sat if x > sat else x))
+
+    # Convert to 0..100 with a smooth mapping (sigmoid lookup table).
+    # raw around 0 means ~50.
+    idx = int((raw + 1.0) * 2048.0 + 0.5)
+    if idx < 0:
+        idx = 0
+    elif idx > _SIGMOID_STEPS:
+        idx = _SIGMOID_STEPS
+    return _SIGMOID_LUT[idx]
 
-def _normalize_dependencies(n: int) -> float:
-    return _clip_0_1(n / 15)
+def score_project(p: AnyProjectInput, w: Weights = DEFAULT_WEIGHTS) -> Tuple[int, Tuple[str, ...]]:
+    kernels = _KERNELS if w is DEFAULT_WEIGHTS else _kernels(w)
+    score = _score_numeric(_FEATURE_GETTER(p), kernels)
 
-def score_project(p: ProjectInput, w: Weights = DEFAULT_WEIGHTS) -> Tuple[int, List[str]]:
-    rationale: List[str] = []
+    # Explainability. Trigger top reasons.
+    rationale = tuple(msg for attr, threshold, msg in _RATIONALE_RULES if getattr(p, attr) >= threshold)
 
-    pos = 0.0
-    neg = 0.0
+    if not rationale:
+        rationale = ("Signals are balanced. Decision depends on risk controls and milestone clarity.",)
 
-    ci = _scale_1_to_5(p.customer_impact)
-    sa = _scale_1_to_5(p.strategic_alignment)
-    tc = _scale_1_to_5(p.technical_complexity)
-    dr = _scale_1_to_5(p.delivery_risk)
-    cr = _scale_1_to_5(p.compliance_risk)
+    return score, rationale
 
-    dep = _normalize_dependencies(p.dependencies_count)
-    team = _normalize_team(p.team_size)
-    dur = _normalize_duration(p.duration_weeks)
-    cost = _normalize_cost(p.estimated_cost_usd)
-    sponsor = 1.0 if p.has_exec_sponsor else 0.0
+@lru_cache(maxsize=1)
+def _batch_lut() -> np.ndarray:
+    import numpy as np
 
-    pos += w.customer_impact * ci
-    pos += w.strategic_alignment * sa
-    pos += w.exec_sponsor * sponsor
+    return np.array(_SIGMOID_LUT, dtype=np.uint8)
 
-    neg += w.technical_complexity * tc
-    neg += w.delivery_risk * dr
-    neg += w.compliance_risk * cr
-    neg += w.dependencies * dep
-    neg += w.team_size * team
-    neg += w.duration * dur
-    neg += w.cost * cost
+def score_projects_batch(df: pd.DataFrame, w: Weights = DEFAULT_WEIGHTS) -> np.ndarray:
+    # Same scoring as score_project, computed for every row in one NumPy pass.
+    import numpy as np
 
-    raw = pos - neg
+    kernels = _KERNELS if w is DEFAULT_WEIGHTS else _kernels(w)
 
-    # Convert to 0..100 with a smooth mapping.
-    # raw around 0 means ~50.
-    score = int(round(100 * (1 / (1 + np.exp(-6 * raw)))))
+    # Accumulate column by column, so narrow typed columns are read as stored rather
+    # than widened into one float matrix. Summation order matches score_project.
+    raw = np.zeros(len(df))
+    for col, (lo, sat, eff_w) in zip(_FEATURE_COLUMNS, kernels):
+        raw += eff_w * np.clip(df[col].to_numpy() - lo, 0, sat)
 
-    # Explainability. Trigger top reasons.
-    if p.customer_impact >= 4:
-        rationale.append("High customer impact increases priority and expected ROI.")
-    if p.strategic_alignment >= 4:
-        rationale.append("Strong strategic alignment supports funding and stakeholder commitment.")
-    if p.has_exec_sponsor:
-        rationale.append("Executive sponsorship reduces coordination risk and accelerates decisions.")
-
-    if p.delivery_risk >= 4:
-        rationale.append("High delivery risk suggests you need stronger plan, milestones, and contingency.")
-    if p.technical_complexity >= 4:
-        rationale.append("High technical complexity suggests discovery, architecture review, and phased rollout.")
-    if p.compliance_risk >= 4:
-        rationale.append("High compliance risk requires early security and legal review with clear controls.")
-    if p.dependencies_count >= 8:
-        rationale.append("Many dependencies increase schedule risk. Consider de-risking or reducing scope.")
-    if p.duration_weeks >= 26:
-        rationale.append("Long duration increases risk. Consider an MVP milestone or phased delivery.")
+    idx = np.clip(((raw + 1.0) * 2048.0 + 0.5).astype(np.intp), 0, _SIGMOID_STEPS)
+    return _batch_lut()[idx].astype(np.int32)
 
-    if not rationale:
-        rationale.append("Signals are balanced. Decision depends on risk controls and milestone clarity.")
+def decide(score: int, p: AnyProjectInput) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+    # Decision thresholds tuned for a simple, intuitive demo. 45+ needs review, 70+ is a go.
+    tier = (score >= 45) + (score >= 70)
+    decision, next_steps = _TIERS[tier]
 
-    return score, rationale
+    match, attrs, threshold, prefix = _TIER_PREFIX_RULES[tier]
+    if match(getattr(p, attr) >= threshold for attr in attrs):
+        next_steps = (prefix, *next_steps)
+    return decision, next_steps, _GUARDRAILS
 
-def decide(score: int, p: ProjectInput) -> Tuple[str, List[str], List[str]]:
-    guardrails = [
-        "Define success metrics and leading indicators before execution.",
-        "Require a written risk register with owners and mitigation dates.",
-        "Use stage gates for funding. Discovery, MVP, Scale.",
-    ]
-
-    next_steps: List[str] = []
-
-    # Decision thresholds tuned for a simple, intuitive demo.
-    if score >= 70:
-        decision = "GO"
-        next_steps = [
-            "Lock success metrics. North Star plus 3 supporting KPIs.",
-            "Create a milestone plan. Discovery, MVP, rollout.",
-            "Confirm resourcing and ownership across teams.",
-        ]
-        if p.delivery_risk >= 4 or p.technical_complexity >= 4:
-            next_steps.insert(0, "Run a 2-week discovery sprint to validate approach and reduce risk.")
-        return decision, next_steps, guardrails
-
-    if 45 <= score < 70:
-        decision = "NEEDS REVIEW"
-        next_steps = [
-            "Identify the top 3 risks and create a mitigation plan with owners.",
-            "Reduce scope to an MVP. One user journey, one workflow.",
-            "Confirm dependency commitments in writing.",
-            "Add instrumentation and an A/B test plan if user-facing.",
-        ]
-        if p.compliance_risk >= 4:
-            next_steps.insert(0, "Schedule security and compliance review within 7 days.")
-        return decision, next_steps, guardrails
-
-    decision = "NO-GO"
-    next_steps = [
-        "Write a one-page alternative plan. Smaller scope or different approach.",
-        "Re-evaluate after risks are reduced or strategy changes.",
-        "If still needed, run a discovery spike to validate feasibility and cost.",
-    ]
-    if p.customer_impact >= 4 and p.strategic_alignment >= 4:
-        next_steps.insert(0, "This looks valuable, but current risk is too high. De-risk with discovery and an MVP.")
-    return decision, next_steps, guardrails
-
-def run_decision(p: ProjectInput) -> DecisionOutput:
+@lru_cache(maxsize=512)
+def _run_decision_cached(key: Tuple) -> DecisionOutput:
+    # Only the scoring fields are in the key, so the input is rebuilt without names or notes.
+    p = ProjectInput.model_construct(**dict(zip(_FEATURE_COLUMNS, key)))
     score, rationale = score_project(p)
     decision, next_steps, guardrails = decide(score, p)
 
-    return DecisionOutput(
+    # Everything here is built internally from trusted constants, so skip validation.
+    return DecisionOutput.model_construct(
         decision=decision,
         score=score,
         rationale=rationale,
         recommended_next_steps=next_steps,
         guardrails=guardrails,
     )
+
+def run_decision(p: AnyProjectInput) -> DecisionOutput:
+    # Streamlit reruns the script on every widget change. Identical inputs hit the cache.
+    return _run_decision_cached(_FEATURE_GETTER(p))
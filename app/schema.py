@@ -1,9 +1,12 @@
-from pydantic import BaseModel, Field
-from typing import Literal, Optional
+from dataclasses import dataclass
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+from typing import Literal, Optional, Union
 
 DecisionType = Literal["GO", "NO-GO", "NEEDS REVIEW"]
 
 class ProjectInput(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="ignore", validate_assignment=False)
+
     project_name: str = Field(..., min_length=3, max_length=80)
     objective: str = Field(..., min_length=10, max_length=400)
 
@@ -24,9 +27,48 @@ class ProjectInput(BaseModel):
     has_exec_sponsor: bool = False
     notes: Optional[str] = Field(default="", max_length=600)
 
+# ProjectInput's free-text fields on their own. Widgets do not constrain these.
+_ProjectText = create_model(
+    "ProjectText",
+    **{name: (ProjectInput.model_fields[name].annotation, ProjectInput.model_fields[name])
+       for name in ("project_name", "objective", "notes")},
+)
+
+@dataclass(slots=True, frozen=True)
+class ProjectInputFast:
+    # Mirror of ProjectInput for the interactive path. Widgets already enforce the
+    # numeric ranges, so only the free-text fields are validated here.
+    project_name: str
+    objective: str
+
+    team_size: int
+    duration_weeks: int
+    estimated_cost_usd: int
+
+    customer_impact: int
+    strategic_alignment: int
+    technical_complexity: int
+    delivery_risk: int
+    compliance_risk: int
+
+    dependencies_count: int = 0
+    has_exec_sponsor: bool = False
+    notes: Optional[str] = ""
+
+    def __post_init__(self) -> None:
+        _ProjectText(project_name=self.project_name, objective=self.objective, notes=self.notes)
+
+# Validates a whole batch (e.g. CSV records) with one compiled validator.
+PROJECT_LIST_ADAPTER = TypeAdapter(list[ProjectInput])
+
+AnyProjectInput = Union[ProjectInput, ProjectInputFast]
+
 class DecisionOutput(BaseModel):
+    # Frozen because run_decision hands the same cached instance to every caller.
+    model_config = ConfigDict(frozen=True)
+
     decision: DecisionType
     score: int  # 0..100
-    rationale: list[str]
-    recommended_next_steps: list[str]
-    guardrails: list[str]
+    rationale: tuple[str, ...]
+    recommended_next_steps: tuple[str, ...]
+    guardrails: tuple[str, ...]
@@ -1,9 +1,12 @@
+import json
 import os
+from dataclasses import asdict
 import streamlit as st
 import pandas as pd
+from pydantic import TypeAdapter, ValidationError
 
-from schema import ProjectInput
-from decision_engine import run_decision
+from schema import PROJECT_LIST_ADAPTER, ProjectInput, ProjectInputFast
+from decision_engine import run_decision, score_projects_batch
 
 
 st.set_page_config(
@@ -56,7 +59,8 @@ run = st.button("Generate decision", type="primary")
 
 if run:
     try:
-        p = ProjectInput(
+        # Widgets already enforce numeric ranges, so only the text fields are validated here.
+        p = ProjectInputFast(
             project_name=project_name,
             objective=objective,
             team_size=int(team_size),
@@ -90,6 +94,8 @@ if run:
 
         st.divider()
         st.write("### Export")
+        # Export boundary: run the full schema once before anything leaves the app.
+        ProjectInput.model_validate(asdict(p))
         export = {
             "project_name": p.project_name,
             "objective": p.objective,
@@ -101,7 +107,7 @@ if run:
         }
         st.download_button(
             "Download decision as JSON",
-            data=str(export).encode("utf-8"),
+            data=json.dumps(export, indent=2).encode("utf-8"),
             file_name="decision_output.json",
             mime="application/json",
         )
@@ -112,8 +118,72 @@ if run:
 st.subheader("3) Sample data")
 st.caption("A small CSV you can expand. Useful for showing you think about systems and measurement.")
 
+SAMPLES_PATH = "data/sample_projects.csv"
+
+# Narrowest dtypes that hold the ProjectInput field ranges. Applied only after
+# validation, so out-of-range values are rejected rather than wrapped.
+SAMPLE_DTYPES = {
+    "customer_impact": "int8",
+    "strategic_alignment": "int8",
+    "technical_complexity": "int8",
+    "delivery_risk": "int8",
+    "compliance_risk": "int8",
+    "team_size": "int16",
+    "duration_weeks": "int16",
+    "estimated_cost_usd": "int32",
+    "dependencies_count": "int8",
+    "has_exec_sponsor": "bool",
+}
+
+# Schema defaults for the optional scoring columns (dependencies_count, has_exec_sponsor).
+SAMPLE_DEFAULTS = {
+    name: ProjectInput.model_fields[name].default
+    for name in SAMPLE_DTYPES
+    if not ProjectInput.model_fields[name].is_required()
+}
+
+def _csv_records(df: pd.DataFrame) -> list[dict]:
+    # pandas reads blank cells as NaN. Drop them so pydantic applies the field defaults.
+    records = df.astype(object).where(df.notna(), None).to_dict("records")
+    return [{k: v for k, v in r.items() if v is not None} for r in records]
+
+def _sample_features(df: pd.DataFrame) -> pd.DataFrame:
+    # Scoring columns of an already validated frame, with schema defaults filled in.
+    features = df.reindex(columns=list(SAMPLE_DTYPES)).fillna(SAMPLE_DEFAULTS)
+    # Cells pandas left as strings (e.g. "yes") are coerced the way pydantic accepted them.
+    for col in features.columns:
+        if pd.api.types.is_numeric_dtype(features[col]):
+            continue
+        adapter = TypeAdapter(list[ProjectInput.model_fields[col].annotation])
+        features[col] = adapter.validate_python(features[col].tolist())
+    return features.astype(SAMPLE_DTYPES)
+
+@st.cache_data(ttl=3600)
+def _load_samples(path: str, mtime: float) -> pd.DataFrame:
+    # mtime is only part of the cache key, so edits to the CSV invalidate it.
+    return pd.read_csv(path)
+
+@st.cache_data(ttl=3600)
+def _load_sample_features(path: str, mtime: float) -> pd.DataFrame:
+    # Validated scoring columns in SAMPLE_DTYPES, cached so reruns reuse the narrow arrays.
+    # Raises ValidationError, which st.cache_data does not cache.
+    df = _load_samples(path, mtime)
+    PROJECT_LIST_ADAPTER.validate_python(_csv_records(df))
+    return _sample_features(df)
+
 try:
-    df = pd.read_csv("data/sample_projects.csv")
-    st.dataframe(df, use_container_width=True)
-except Exception:
+    mtime = os.path.getmtime(SAMPLES_PATH)
+    df = _load_samples(SAMPLES_PATH, mtime)
+except FileNotFoundError:
     st.info("Add `data/sample_projects.csv` to display sample data here.")
+else:
+    try:
+        features = _load_sample_features(SAMPLES_PATH, mtime)
+    except ValidationError as e:
+        st.warning(
+            f"Sample data did not validate ({e.error_count()} errors across {len(df)} rows), "
+            "so it is shown unscored."
+        )
+    else:
+        df["score"] = score_projects_batch(features)
+    st.dataframe(df, use_container_width=True)